@@ -11,6 +11,9 @@ import time
 import logging
 import json
 import os
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
 from datetime import datetime
 
 # 导入全局配置
@@ -19,6 +22,93 @@ from config import GAME_CONFIG
 # 获取日志记录器
 logger = logging.getLogger(__name__)
 
+# 日志分隔线，避免在热路径上反复构造
+_BANNER = "=" * 60
+
+class _TagLoggerAdapter(logging.LoggerAdapter):
+    """自动为日志消息附加 [动作名] 前缀的适配器
+
+    前缀在通过级别过滤之后才拼接，调用点不再需要在每条消息里手写
+    "[XXX] " 前缀字符串。
+    """
+
+    def process(self, msg, kwargs):
+        return "[%s] %s" % (self.extra["tag"], msg), kwargs
+
+
+def _action_logger(tag: str) -> logging.LoggerAdapter:
+    """返回带 [tag] 前缀的上下文 logger"""
+    return _TagLoggerAdapter(logger, {"tag": tag})
+
+
+_reset_logger = _action_logger("ResetCharacterPosition")
+_battle_logger = _action_logger("AutoBattle")
+_rounds_logger = _action_logger("MultiRoundsAutoBattle")
+
+
+# OCR 识别结果缓存：按 (节点名, 截图内容摘要) 记忆 run_recognition 的结果。
+# 重试期间画面没有变化时，同一节点不再重复 OCR
+# （单次 OCR 约 50~260ms，而哈希一帧只需 1~3ms）。
+_OCR_CACHE: OrderedDict = OrderedDict()
+_OCR_CACHE_MAX = 64
+
+
+@lru_cache(maxsize=64)
+def _parse_param_cached(raw: str):
+    """
+    解析 custom_action_param 字符串：相同参数只做一次 json.loads
+
+    多轮战斗会拿同一个 argv 反复调用动作，缓存省去每轮的重复解析。
+    返回的 dict 为共享对象，调用方不要就地修改。
+    """
+    return json.loads(raw)
+
+
+def _image_digest(image) -> bytes:
+    """
+    计算截图内容的摘要（blake2b，16 字节），用作缓存键
+
+    连续内存的 ndarray 直接按底层缓冲区哈希，
+    省去 tobytes() 的整帧拷贝（1080p 约 6MB/次）。
+    """
+    flags = getattr(image, "flags", None)
+    if flags is not None and flags["C_CONTIGUOUS"]:
+        data = image.data
+    elif hasattr(image, "tobytes"):
+        data = image.tobytes()
+    else:
+        data = bytes(image)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _crop_roi(image, roi):
+    """按 [x, y, w, h] 裁剪截图（ndarray 切片，不拷贝）；roi 为空时原样返回"""
+    if not roi:
+        return image
+    x, y, w, h = roi
+    return image[y:y + h, x:x + w]
+
+
+def _recognize_cached(context: Context, node_name: str, image, digest: bytes = None):
+    """
+    带缓存的 run_recognition：同一帧画面上的同一节点只识别一次
+
+    digest 可由调用方预先算好（同一帧识别多个节点时避免重复哈希）。
+    """
+    if digest is None:
+        digest = _image_digest(image)
+    key = (node_name, digest)
+    cached = _OCR_CACHE.get(key)
+    if cached is not None:
+        _OCR_CACHE.move_to_end(key)
+        logger.debug("[OCR缓存] 命中: '%s'，跳过识别", node_name)
+        return cached
+    result = context.run_recognition(node_name, image)
+    _OCR_CACHE[key] = result
+    if len(_OCR_CACHE) > _OCR_CACHE_MAX:
+        _OCR_CACHE.popitem(last=False)
+    return result
+
 @AgentServer.custom_action("ResetCharacterPosition")
 class ResetCharacterPosition(CustomAction):
     """
@@ -41,15 +131,15 @@ class ResetCharacterPosition(CustomAction):
             pipeline_override = {}
             if isinstance(argv.custom_action_param, str) and argv.custom_action_param.strip():
                 try:
-                    params = json.loads(argv.custom_action_param)
+                    params = _parse_param_cached(argv.custom_action_param)
                     pipeline_override = params.get("pipeline_override", {}) or {}
                 except json.JSONDecodeError:
-                    logger.warning("[ResetCharacterPosition] custom_action_param 不是有效 JSON，忽略覆盖参数")
+                    _reset_logger.warning("custom_action_param 不是有效 JSON，忽略覆盖参数")
             elif isinstance(argv.custom_action_param, dict):
                 pipeline_override = argv.custom_action_param.get("pipeline_override", {}) or {}
 
-            logger.debug("=" * 60)
-            logger.info("[ResetCharacterPosition] 通过 run_task 执行节点 'Reset_Entry'")
+            logger.debug(_BANNER)
+            _reset_logger.info("通过 run_task 执行节点 'Reset_Entry'")
             if pipeline_override:
                 logger.debug(f"  使用 pipeline_override: {list(pipeline_override.keys())}")
 
@@ -57,16 +147,16 @@ class ResetCharacterPosition(CustomAction):
             task_detail = context.run_task("Reset_Entry", pipeline_override=pipeline_override)
 
             if not task_detail:
-                logger.error("[ResetCharacterPosition] 任务执行失败 (task_id = None)")
-                logger.debug("=" * 60)
+                _reset_logger.error("任务执行失败 (task_id = None)")
+                logger.debug(_BANNER)
                 return False
 
-            logger.info(f"[ResetCharacterPosition] 任务执行成功, task_id={task_detail.task_id}")
-            logger.debug("=" * 60)
+            _reset_logger.info(f"任务执行成功, task_id={task_detail.task_id}")
+            logger.debug(_BANNER)
             return True
 
         except Exception as e:
-            logger.error(f"[ResetCharacterPosition] 执行异常: {e}", exc_info=True)
+            _reset_logger.exception("执行异常: %s", e)
             return False
 
 
@@ -75,6 +165,9 @@ class AutoBattle(CustomAction):
     """
     循环检测目标文字，支持超时处理和中断动作
     当未检测到目标时，执行中断动作（自动战斗）
+
+    可选参数 "hash_roi": [x, y, w, h] —— 只对该 UI 面板区域做帧摘要，
+    用于画面其余部分持续动画的场景（见 _image_digest / 跳帧检测）。
     """
 
     def run(
@@ -86,14 +179,14 @@ class AutoBattle(CustomAction):
         # 支持 JSON 字符串或字典，单位按秒传入，这里转换为毫秒以复用原实现
         try:
             if isinstance(argv.custom_action_param, str):
-                params = json.loads(argv.custom_action_param)
+                params = _parse_param_cached(argv.custom_action_param)
             elif isinstance(argv.custom_action_param, dict):
                 params = argv.custom_action_param
             else:
-                logger.error(f"[AutoBattle] 参数类型错误: {type(argv.custom_action_param)}")
+                _battle_logger.error(f"参数类型错误: {type(argv.custom_action_param)}")
                 return False
         except json.JSONDecodeError as e:
-            logger.error(f"[AutoBattle] JSON 解析失败: {e}")
+            _battle_logger.error(f"JSON 解析失败: {e}")
             logger.error(f"  参数内容: {argv.custom_action_param}")
             return False
 
@@ -112,90 +205,121 @@ class AutoBattle(CustomAction):
         # 兼容旧配置：如果 target_node 是字符串，转换为数组
         if isinstance(target_nodes, str):
             target_nodes = [target_nodes]
-        
-        logger.info("=" * 50)
-        logger.info("[AutoBattle] 开始战斗循环检测")
+
+        # 可选：摘要区域 [x, y, w, h]。战斗画面常年有动画，整帧哈希几乎每帧
+        # 都不同，会让缓存与跳帧检测完全失效；配置目标文字所在 UI 面板的
+        # 区域后，只对该面板做摘要，面板未变化即可命中。区域需覆盖所有
+        # 目标文字可能出现的位置。
+        hash_roi = params.get("hash_roi")
+        if hash_roi is not None and (not isinstance(hash_roi, (list, tuple)) or len(hash_roi) != 4):
+            _battle_logger.warning("hash_roi 应为 [x, y, w, h]，已忽略: %s", hash_roi)
+            hash_roi = None
+
+        logger.info(_BANNER)
+        _battle_logger.info("开始战斗循环检测")
         logger.info(f"  检测间隔: {check_interval}ms, 单轮超时: {round_timeout}ms")
         # logger.info(f"  目标节点: {target_nodes}, 中断节点: {interrupt_node}")
         
         try:
+            # tasker/controller 在整个循环中不变，提到循环外避免重复取属性
+            tasker = context.tasker
+            controller = tasker.controller
+
             # 开始循环检测目标节点
             start_time = time.time()
             loop_count = 0
-            
+            last_miss_digest = None  # 上一次全部未命中时的帧摘要，用于跳过未变化画面
+
             while True:
-                if context.tasker.stopping:
-                    logger.info("[AutoBattle] 任务暂停")
+                if tasker.stopping:
+                    _battle_logger.info("任务暂停")
                     return False
                 loop_count += 1
                 elapsed = (time.time() - start_time) * 1000  # 已经过的时间（毫秒）
                 
                 # 检查是否超时
                 if elapsed >= round_timeout:
-                    logger.warning(f"[AutoBattle] 超时 {round_timeout}ms，跳转到 on_error")
-                    logger.info(f"  总循环次数: {loop_count}")
+                    _battle_logger.warning("超时 %sms，跳转到 on_error", round_timeout)
+                    logger.info("  总循环次数: %d", loop_count)
                     return False
                 
                 # 尝试检测目标节点
-                logger.info(f"[AutoBattle] 第 {loop_count} 次检测 {target_nodes}... (已用时: {int(elapsed)}ms / {round_timeout}ms)")
+                _battle_logger.info("第 %d 次检测 %s... (已用时: %dms / %sms)", loop_count, target_nodes, int(elapsed), round_timeout)
                 
                 # 获取最新截图
-                sync_job = context.tasker.controller.post_screencap()
+                sync_job = controller.post_screencap()
                 sync_job.wait()
-                image = context.tasker.controller.cached_image  # 这是属性,不是方法
-                
+                image = controller.cached_image  # 这是属性,不是方法
+                # 同一帧只哈希一次，供各节点缓存共用；配置了 hash_roi 时只摘要面板区域
+                frame_digest = _image_digest(_crop_roi(image, hash_roi))
+
                 # 依次对所有目标节点进行识别
                 detected_node = None
                 reco_result = None
-                
-                for target_node in target_nodes:
-                    logger.debug(f"[AutoBattle] -> 尝试识别节点: '{target_node}'")
+
+                # 画面与上次全部未命中的那一帧完全一致时，识别结果不可能变化，
+                # 直接跳过本轮识别，省下整组 OCR 调用
+                if frame_digest == last_miss_digest:
+                    _battle_logger.debug("-> 画面未变化，跳过本轮识别")
+                    target_iter = ()
+                else:
+                    target_iter = target_nodes
+
+                for target_node in target_iter:
+                    _battle_logger.debug("-> 尝试识别节点: '%s'", target_node)
                     # 新版 run_recognition 总是返回 RecognitionDetail，使用 .hit 判断是否命中
-                    current_reco_result = context.run_recognition(target_node, image)
+                    current_reco_result = _recognize_cached(context, target_node, image, digest=frame_digest)
 
-                    # RecognitionDetail.hit 表示是否命中；额外检查 box 保持向后兼容
+                    # RecognitionDetail.hit 表示是否命中；box 校验只影响日志措辞，
+                    # box 取一次属性即可，不必重复走三遍属性链
                     if getattr(current_reco_result, "hit", False):
-                        if current_reco_result.box and current_reco_result.box.w > 0 and current_reco_result.box.h > 0:
-                            logger.info(f"[AutoBattle] -> [OK] 识别到节点: '{target_node}'")
-                            detected_node = target_node
-                            reco_result = current_reco_result
-                            break
+                        box = current_reco_result.box
+                        if box and box.w > 0 and box.h > 0:
+                            _battle_logger.info("-> [OK] 识别到节点: '%s'", target_node)
                         else:
                             # hit 为 True 但没有有效 box 时，也认为命中（容错）
-                            logger.info(f"[AutoBattle] -> [OK] 识别到节点(无 box): '{target_node}'")
-                            detected_node = target_node
-                            reco_result = current_reco_result
-                            break
+                            _battle_logger.info("-> [OK] 识别到节点(无 box): '%s'", target_node)
+                        detected_node = target_node
+                        reco_result = current_reco_result
+                        break
                     else:
-                        logger.debug(f"[AutoBattle] -> [X] 未识别到节点: '{target_node}'")
+                        _battle_logger.debug("-> [X] 未识别到节点: '%s'", target_node)
                 
                 # 检查是否有任何一个节点被识别到
                 if detected_node:
                     # 新逻辑：直接返回 True，不再 override_next
                     return True
                 else:
+                    # 记录未命中帧的摘要：下次画面若仍一致则无需再识别
+                    last_miss_digest = frame_digest
+
                     # 从全局配置获取自动战斗模式
                     auto_battle_mode = GAME_CONFIG.get("auto_battle_mode", 0)
                     
+                    click_job = None
                     if auto_battle_mode == 0:
                         # 模式 0: 循环按 E 键（默认）
-                        logger.debug(f"[AutoBattle] -> 模式 0: 执行自动战斗（按 E 键）")
-                        click_job = context.tasker.controller.post_click_key(69)  # E 键
-                        click_job.wait()
+                        _battle_logger.debug("-> 模式 0: 执行自动战斗（按 E 键）")
+                        click_job = controller.post_click_key(69)  # E 键
                     elif auto_battle_mode == 1:
                         # 模式 1: 什么也不做
-                        logger.debug(f"[AutoBattle] -> 模式 1: 什么也不做，仅等待")
+                        _battle_logger.debug("-> 模式 1: 什么也不做，仅等待")
                     else:
-                        logger.warning(f"[AutoBattle] -> 未知模式 {auto_battle_mode}，默认执行模式 0")
-                        click_job = context.tasker.controller.post_click_key(69)  # E 键
-                        click_job.wait()
+                        _battle_logger.warning("-> 未知模式 %s，默认执行模式 0", auto_battle_mode)
+                        click_job = controller.post_click_key(69)  # E 键
 
-                    # 等待检测间隔
-                    logger.debug(f"[AutoBattle] -> 等待检测间隔 {check_interval}ms...")
+                    # 先提交按键任务再睡眠，让控制器往返与检测间隔并行执行，
+                    # 睡醒后统一 wait()，每轮省下一次同步往返
+                    _battle_logger.debug("-> 等待检测间隔 %sms...", check_interval)
                     time.sleep(check_interval / 1000.0)
+
+                    if click_job is not None:
+                        click_job.wait()
+                        # 按键后画面已经变化，作废旧帧的识别缓存
+                        _OCR_CACHE.clear()
                     
         except Exception as e:
-            logger.error(f"[AutoBattle] 发生异常: {e}", exc_info=True)
+            _battle_logger.exception("发生异常: %s", e)
             return False
 
 @AgentServer.custom_action("MultiRoundsAutoBattle")
@@ -213,14 +337,14 @@ class MultiRoundsAutoBattle(CustomAction):
         # 从参数中获取配置（仅 target_node 与 post_rounds）
         try:
             if isinstance(argv.custom_action_param, str):
-                params = json.loads(argv.custom_action_param)
+                params = _parse_param_cached(argv.custom_action_param)
             elif isinstance(argv.custom_action_param, dict):
                 params = argv.custom_action_param
             else:
-                logger.error(f"[MultiRoundsAutoBattle] 参数类型错误: {type(argv.custom_action_param)}")
+                _rounds_logger.error(f"参数类型错误: {type(argv.custom_action_param)}")
                 return False
         except json.JSONDecodeError as e:
-            logger.error(f"[MultiRoundsAutoBattle] JSON 解析失败: {e}")
+            _rounds_logger.error(f"JSON 解析失败: {e}")
             logger.error(f"  参数内容: {argv.custom_action_param}")
             return False
         
@@ -236,8 +360,8 @@ class MultiRoundsAutoBattle(CustomAction):
         round_timeout = GAME_CONFIG.get("round_timeout_ms", 420000)
         post_rounds = params.get("post_rounds", [])  # 每轮后的处理节点列表
         
-        logger.info("=" * 50)
-        logger.info("[MultiRoundsAutoBattle] 开始多轮自动战斗")
+        logger.info(_BANNER)
+        _rounds_logger.info("开始多轮自动战斗")
         logger.info(f"  总轮数: {total_rounds} (来自全局配置), 每轮超时: {round_timeout}ms")
         
         # 提前创建 AutoBattle 实例，避免在 total_rounds == 1 时未定义变量的问题
@@ -245,29 +369,29 @@ class MultiRoundsAutoBattle(CustomAction):
 
         # 执行前 (total_rounds-1) 轮，每轮完成后执行 post_rounds
         for round_num in range(1, total_rounds):
-            logger.info(f"[MultiRoundsAutoBattle] 第 {round_num}/{total_rounds} 轮战斗开始")
+            _rounds_logger.info("第 %d/%d 轮战斗开始", round_num, total_rounds)
 
             result = auto_battle_action.run(context, argv)
 
             if not result:
-                logger.error(f"[MultiRoundsAutoBattle] 第 {round_num} 轮战斗失败或超时，终止多轮战斗")
+                _rounds_logger.error("第 %d 轮战斗失败或超时，终止多轮战斗", round_num)
                 return False
 
-            logger.info(f"[MultiRoundsAutoBattle] 第 {round_num} 轮战斗完成")
+            _rounds_logger.info("第 %d 轮战斗完成", round_num)
 
             # 执行每轮后的处理节点（异步/同步由 context.run_task 决定）
             for post_node in post_rounds:
                 try:
                     context.run_task(post_node)
                 except Exception as e:
-                    logger.warning(f"[MultiRoundsAutoBattle] 执行 post_round '{post_node}' 时出错: {e}")
+                    _rounds_logger.warning("执行 post_round '%s' 时出错: %s", post_node, e)
 
         # 最后一轮（或仅有的一轮）
-        logger.info(f"[MultiRoundsAutoBattle] 第 {total_rounds}/{total_rounds} 轮战斗开始")
+        _rounds_logger.info(f"第 {total_rounds}/{total_rounds} 轮战斗开始")
         last_result = auto_battle_action.run(context, argv)
         if not last_result:
-            logger.error(f"[MultiRoundsAutoBattle] 最后一轮战斗失败或超时")
+            _rounds_logger.error(f"最后一轮战斗失败或超时")
             return False
-        logger.info(f"[MultiRoundsAutoBattle] [OK] 所有 {total_rounds} 轮战斗已完成")
-        logger.info("=" * 50)
+        _rounds_logger.info(f"[OK] 所有 {total_rounds} 轮战斗已完成")
+        logger.info(_BANNER)
         return True
\ No newline at end of file
@@ -18,18 +18,33 @@ print(f"脚本目录: {script_dir}")
 print(f"工作目录: {os.getcwd()}")
 print(f"Python 路径: {sys.path[:3]}")  # 只打印前3个
 
+import importlib
+
 from maa.agent.agent_server import AgentServer
 from maa.toolkit import Toolkit
 
 # 导入全局配置
 from config import GAME_CONFIG
 
-# 重要：必须在 AgentServer.start_up() 之前导入，以便装饰器注册自定义 Action 和 Recognition
-import common
-import setting
-from movement_action import RunWithShift, LongPressKey, PressMultipleKeys, RunWithJump, JsonActionSequence
 import tools
 
+# 自定义 Action 模块清单：模块导入时装饰器会向 AgentServer 完成注册。
+# 通过 register_custom_actions() 在 AgentServer.start_up() 之前统一导入，
+# 而不是在模块顶层逐个 import —— 请求管理员提权的父进程只负责重新拉起
+# 自己，推迟后就不会再白白加载全部动作模块及其 win32 依赖。
+CUSTOM_ACTION_MODULES = (
+    "common",
+    "setting",
+    "movement_action.actions",
+    "movement_action.action_sequence",
+)
+
+
+def register_custom_actions():
+    """按清单导入自定义 Action 模块，触发装饰器注册"""
+    for module_name in CUSTOM_ACTION_MODULES:
+        importlib.import_module(module_name)
+
 
 def is_admin():
     """检查是否以管理员权限运行"""
@@ -110,7 +125,10 @@ def main():
     logger.info("[OK] 以管理员权限运行")
     logger.info(f"脚本目录: {script_dir}")
     logger.info(f"工作目录: {os.getcwd()}")
-    
+
+    # 重要：必须在 AgentServer.start_up() 之前完成自定义 Action 注册
+    register_custom_actions()
+    logger.info(f"已注册自定义 Action 模块: {CUSTOM_ACTION_MODULES}")
 
     Toolkit.init_option("./")
 
@@ -130,7 +148,7 @@ def main():
         AgentServer.join()
         logger.info("AgentServer 正常退出")
     except Exception as e:
-        logger.error(f"AgentServer 运行出错: {e}", exc_info=True)
+        logger.exception("AgentServer 运行出错: %s", e)
         raise
     finally:
         logger.info("关闭 AgentServer...")
@@ -3,15 +3,30 @@ PostMessage 自定义动作模块
 
 说明: 旧版的 PostMessageInputHelper 已移除，
 当前仅导出使用 Maa 控制器 API 的自定义动作。
+
+动作类按需惰性导入（PEP 562）：首次访问导出名时才加载对应子模块，
+子模块导入时装饰器会照常完成 AgentServer 注册，
+未用到的子模块（及其 win32 依赖）则不会被加载。
 """
 
-from .actions import RunWithShift, LongPressKey, PressMultipleKeys, RunWithJump
-from .action_sequence import JsonActionSequence
+from importlib import import_module
+
+# 各导出名 -> 所在子模块
+_LAZY_IMPORTS = {
+    'RunWithShift': 'actions',
+    'LongPressKey': 'actions',
+    'PressMultipleKeys': 'actions',
+    'RunWithJump': 'actions',
+    'JsonActionSequence': 'action_sequence',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
 
-__all__ = [
-    'RunWithShift',
-    'LongPressKey',
-    'PressMultipleKeys',
-    'RunWithJump',
-    'JsonActionSequence',
-]
+def __getattr__(name):
+    submodule = _LAZY_IMPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f'.{submodule}', __name__), name)
+    globals()[name] = value  # 缓存结果，后续访问不再经过 __getattr__
+    return value
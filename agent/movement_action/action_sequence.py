@@ -177,7 +177,7 @@ class JsonActionSequence(CustomAction):
             return success
             
         except Exception as e:
-            logger.error(f"[JsonActionSequence] 发生异常: {e}", exc_info=True)
+            logger.exception("[JsonActionSequence] 发生异常: %s", e)
             logger.info("=" * 60)
             return False
     
@@ -330,9 +330,11 @@ class JsonActionSequence(CustomAction):
             bool: 执行是否成功
         """
         try:
+            # 控制器在整个序列中不变，提到循环外，避免每个动作都重复取属性
+            controller = context.tasker.controller
             start_time = time.time()
             last_action_time = 0.0
-            
+
             for i, action in enumerate(actions):
                 action_time = action["time"]
                 action_type = action["type"]
@@ -352,7 +354,6 @@ class JsonActionSequence(CustomAction):
                 #           f"(计划: {action_time:6.3f}s, 实际: {current_relative_time:6.3f}s)")
                 
                 # 执行按键操作
-                controller = context.tasker.controller
                 if action_type == "key_down":
                     controller.post_key_down(key).wait()
                 elif action_type == "key_up":
@@ -379,7 +380,7 @@ class JsonActionSequence(CustomAction):
             return True
             
         except Exception as e:
-            logger.error(f"[{sequence_name}] 执行动作序列时发生异常: {e}", exc_info=True)
+            logger.exception("[%s] 执行动作序列时发生异常: %s", sequence_name, e)
             return False
     
     def _key_to_str(self, key):
@@ -225,7 +225,7 @@ class RunWithShift(CustomAction):
             return True
             
         except Exception as e:
-            logger.error(f"[RunWithShift] 发生异常: {e}", exc_info=True)
+            logger.exception("[RunWithShift] 发生异常: %s", e)
             return False
 
 @AgentServer.custom_action("LongPressKey")
@@ -290,7 +290,7 @@ class LongPressKey(CustomAction):
             return True
             
         except Exception as e:
-            logger.error(f"[LongPressKey] 发生异常: {e}", exc_info=True)
+            logger.exception("[LongPressKey] 发生异常: %s", e)
             return False
 
 @AgentServer.custom_action("PressMultipleKeys")
@@ -360,7 +360,7 @@ class PressMultipleKeys(CustomAction):
             return True
             
         except Exception as e:
-            logger.error(f"[PressMultipleKeys] 发生异常: {e}", exc_info=True)
+            logger.exception("[PressMultipleKeys] 发生异常: %s", e)
             return False
 
 @AgentServer.custom_action("RunWithJump")
@@ -440,33 +440,34 @@ class RunWithJump(CustomAction):
             logger.debug(f"[RunWithJump] 步骤 3: 开始周期性跳跃...")
             start_time = time.time()
             jump_count = 0
+            end_time = start_time + duration
             next_jump_time = start_time + jump_interval
-            
+
             while True:
                 current_time = time.time()
-                elapsed_time = current_time - start_time
-                
+
                 # 检查是否达到总时长
-                if elapsed_time >= duration:
+                if current_time >= end_time:
                     logger.debug(f"[RunWithJump] 达到总时长 {duration:.2f}秒，停止跳跃")
                     break
-                
-                # 检查是否该跳跃了
-                if current_time >= next_jump_time:
-                    jump_count += 1
-                    remaining_time = duration - elapsed_time
-                    logger.debug(f"[RunWithJump] -> 第 {jump_count} 次跳跃 (剩余: {remaining_time:.2f}秒)")
-                    
-                    # 按下空格键
-                    controller.post_key_down(win32con.VK_SPACE).wait()
-                    time.sleep(jump_press_time)
-                    controller.post_key_up(win32con.VK_SPACE).wait()
-                    
-                    # 计算下一次跳跃时间
-                    next_jump_time = current_time + jump_interval
-                else:
-                    # 短暂休眠，避免 CPU 占用过高
-                    time.sleep(0.01)
+
+                # 还没到跳跃时间点：一次睡到下一个事件点（下次跳跃或总时长结束），
+                # 取代原先每 10ms 唤醒一次的轮询
+                if current_time < next_jump_time:
+                    time.sleep(min(next_jump_time, end_time) - current_time)
+                    continue
+
+                jump_count += 1
+                remaining_time = end_time - current_time
+                logger.debug(f"[RunWithJump] -> 第 {jump_count} 次跳跃 (剩余: {remaining_time:.2f}秒)")
+
+                # 按下空格键
+                controller.post_key_down(win32con.VK_SPACE).wait()
+                time.sleep(jump_press_time)
+                controller.post_key_up(win32con.VK_SPACE).wait()
+
+                # 计算下一次跳跃时间
+                next_jump_time = current_time + jump_interval
             
             # 4. 释放闪避键
             logger.debug(f"[RunWithJump] 步骤 4: 释放闪避键")
@@ -482,7 +483,7 @@ class RunWithJump(CustomAction):
             return True
             
         except Exception as e:
-            logger.error(f"[RunWithJump] 发生异常: {e}", exc_info=True)
+            logger.exception("[RunWithJump] 发生异常: %s", e)
             # 尝试释放所有按键
             try:
                 controller.post_key_up(win32con.VK_SPACE).wait()
@@ -2,6 +2,10 @@
 """
 设置自定义动作中的参数
 变相实现变量存储流水线中的某些全局设置
+
+五个 Set* 动作原先是近乎相同的复制粘贴实现，现收拢为
+_SetConfigAction 基类 + 每个动作一张描述表（SPEC）：
+解析参数、校验、写入 GAME_CONFIG、刷新截图缓存只保留一份实现。
 """
 
 from maa.agent.agent_server import AgentServer
@@ -16,18 +20,34 @@ from config import GAME_CONFIG
 # 获取日志记录器
 logger = logging.getLogger(__name__)
 
-@AgentServer.custom_action("SetDodgeKey")
-class SetDodgeKey(CustomAction):
+# 哨兵值：表示该参数必填，缺失时报错而不是取默认值
+_REQUIRED = object()
+
+
+class _SetConfigAction(CustomAction):
     """
-    设置闪避键配置
-    用于保存用户选择的闪避键到全局配置中
+    设置类动作的公共实现：解析参数 -> 校验 -> 写入 GAME_CONFIG -> 刷新截图缓存
+
+    子类通过 SPEC 描述表定制行为：
+    {
+        "key":       写入 GAME_CONFIG 的配置键,
+        "param_key": custom_action_param 中的参数键,
+        "default":   默认值（_REQUIRED 表示必填）,
+        "coerce":    是否强制转换为 int（转换失败报错）,
+        "validate":  校验函数 (value) -> 错误消息字符串或 None,
+        "describe":  成功日志函数 (value) -> str,
+    }
     """
 
+    SPEC = {}
+
     def run(
         self,
         context: Context,
         argv: CustomAction.RunArg,
     ) -> bool:
+        tag = type(self).__name__
+        spec = self.SPEC
         try:
             # 解析参数
             if isinstance(argv.custom_action_param, str):
@@ -35,142 +55,108 @@ class SetDodgeKey(CustomAction):
             elif isinstance(argv.custom_action_param, dict):
                 params = argv.custom_action_param
             else:
-                logger.error(f"[SetDodgeKey] 参数类型错误: {type(argv.custom_action_param)}")
+                logger.error(f"[{tag}] 参数类型错误: {type(argv.custom_action_param)}")
+                return False
+
+            param_key = spec["param_key"]
+            val = params.get(param_key, spec["default"])
+            if val is _REQUIRED:
+                logger.error(f"[{tag}] 缺少 {param_key}")
                 return False
-            
-            # 获取闪避键虚拟键码(现在直接是 int)
-            dodge_key_vk = params.get("dodge_key", 0x10)  # 默认 Shift = 0x10
-            
+
+            # 数值型参数统一转换为 int
+            if spec.get("coerce"):
+                try:
+                    val = int(val)
+                except Exception:
+                    logger.error(f"[{tag}] 非法的数值: {val}")
+                    return False
+
+            validate = spec.get("validate")
+            if validate:
+                error = validate(val)
+                if error:
+                    logger.error(f"[{tag}] {error}")
+                    return False
+
             # 保存到全局配置
-            GAME_CONFIG["dodge_key"] = dodge_key_vk
-            
-            logger.info(f"[SetDodgeKey] [OK] 闪避键已设置为: VK=0x{dodge_key_vk:02X} ({dodge_key_vk})")
-            logger.info(f"[SetDodgeKey] 当前配置: {GAME_CONFIG}")
-            
+            GAME_CONFIG[spec["key"]] = val
+
+            logger.info(f"[{tag}] [OK] {spec['describe'](val)}")
+            logger.info(f"[{tag}] 当前配置: {GAME_CONFIG}")
+
             # 强制刷新截图缓存，避免后续节点使用旧图
-            logger.info(f"[SetDodgeKey] 刷新截图缓存...")
+            logger.debug(f"[{tag}] 刷新截图缓存...")
             screencap_job = context.tasker.controller.post_screencap()
             screencap_job.wait()
-            logger.info(f"[SetDodgeKey] [OK] 截图缓存已更新")
-            
+            logger.debug(f"[{tag}] [OK] 截图缓存已更新")
+
             return True
-            
+
         except Exception as e:
-            logger.error(f"[SetDodgeKey] 发生异常: {e}", exc_info=True)
+            logger.exception("[%s] 发生异常: %s", tag, e)
             return False
 
 
+@AgentServer.custom_action("SetDodgeKey")
+class SetDodgeKey(_SetConfigAction):
+    """
+    设置闪避键配置
+    用于保存用户选择的闪避键到全局配置中
+    """
+
+    SPEC = {
+        "key": "dodge_key",
+        "param_key": "dodge_key",
+        "default": 0x10,  # 默认 Shift = 0x10（闪避键现在直接是虚拟键码 int）
+        "describe": lambda v: f"闪避键已设置为: VK=0x{v:02X} ({v})",
+    }
+
+
 @AgentServer.custom_action("SetAutoBattleMode")
-class SetAutoBattleMode(CustomAction):
+class SetAutoBattleMode(_SetConfigAction):
     """
     设置自动战斗模式配置
     用于保存用户选择的自动战斗模式到全局配置中
-    
+
     参数说明：
     {
         "auto_battle_mode": 0  // 自动战斗模式：0=循环按E键（默认）, 1=什么也不做
     }
     """
 
-    def run(
-        self,
-        context: Context,
-        argv: CustomAction.RunArg,
-    ) -> bool:
-        try:
-            # 解析参数
-            if isinstance(argv.custom_action_param, str):
-                params = json.loads(argv.custom_action_param)
-            elif isinstance(argv.custom_action_param, dict):
-                params = argv.custom_action_param
-            else:
-                logger.error(f"[SetAutoBattleMode] 参数类型错误: {type(argv.custom_action_param)}")
-                return False
-            
-            # 获取自动战斗模式（默认为 0）
-            auto_battle_mode = params.get("auto_battle_mode", 0)
-            
-            # 验证模式值
-            if auto_battle_mode not in [0, 1]:
-                logger.error(f"[SetAutoBattleMode] 无效的模式值: {auto_battle_mode}，仅支持 0 或 1")
-                return False
-            
-            # 保存到全局配置
-            GAME_CONFIG["auto_battle_mode"] = auto_battle_mode
-            
-            mode_desc = "循环按E键" if auto_battle_mode == 0 else "什么也不做"
-            logger.info(f"[SetAutoBattleMode] [OK] 自动战斗模式已设置为: {auto_battle_mode} ({mode_desc})")
-            logger.info(f"[SetAutoBattleMode] 当前配置: {GAME_CONFIG}")
-            
-            # 强制刷新截图缓存，避免后续节点使用旧图
-            logger.info(f"[SetAutoBattleMode] 刷新截图缓存...")
-            screencap_job = context.tasker.controller.post_screencap()
-            screencap_job.wait()
-            logger.info(f"[SetAutoBattleMode] [OK] 截图缓存已更新")
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"[SetAutoBattleMode] 发生异常: {e}", exc_info=True)
-            return False
+    SPEC = {
+        "key": "auto_battle_mode",
+        "param_key": "auto_battle_mode",
+        "default": 0,
+        "validate": lambda v: None if v in (0, 1) else f"无效的模式值: {v}，仅支持 0 或 1",
+        "describe": lambda v: f"自动战斗模式已设置为: {v} ({'循环按E键' if v == 0 else '什么也不做'})",
+    }
 
 
 @AgentServer.custom_action("SetBattleRounds")
-class SetBattleRounds(CustomAction):
+class SetBattleRounds(_SetConfigAction):
     """
     设置战斗轮数配置
     用于保存用户选择的战斗轮数到全局配置中
-    
+
     参数说明：
     {
         "battle_rounds": 3  // 战斗轮数：正整数（默认为 3）
     }
     """
 
-    def run(
-        self,
-        context: Context,
-        argv: CustomAction.RunArg,
-    ) -> bool:
-        try:
-            # 解析参数
-            if isinstance(argv.custom_action_param, str):
-                params = json.loads(argv.custom_action_param)
-            elif isinstance(argv.custom_action_param, dict):
-                params = argv.custom_action_param
-            else:
-                logger.error(f"[SetBattleRounds] 参数类型错误: {type(argv.custom_action_param)}")
-                return False
-            
-            # 获取战斗轮数（默认为 3）
-            battle_rounds = params.get("battle_rounds", 3)
-            
-            # 验证轮数值（必须是正整数）
-            if not isinstance(battle_rounds, int) or battle_rounds <= 0:
-                logger.error(f"[SetBattleRounds] 无效的轮数值: {battle_rounds}，必须是正整数")
-                return False
-            
-            # 保存到全局配置
-            GAME_CONFIG["battle_rounds"] = battle_rounds
-            
-            logger.info(f"[SetBattleRounds] [OK] 战斗轮数已设置为: {battle_rounds}")
-            logger.info(f"[SetBattleRounds] 当前配置: {GAME_CONFIG}")
-            
-            # 强制刷新截图缓存，避免后续节点使用旧图
-            logger.info(f"[SetBattleRounds] 刷新截图缓存...")
-            screencap_job = context.tasker.controller.post_screencap()
-            screencap_job.wait()
-            logger.info(f"[SetBattleRounds] [OK] 截图缓存已更新")
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"[SetBattleRounds] 发生异常: {e}", exc_info=True)
-            return False
+    SPEC = {
+        "key": "battle_rounds",
+        "param_key": "battle_rounds",
+        "default": 3,
+        "validate": lambda v: None if isinstance(v, int) and v > 0 else f"无效的轮数值: {v}，必须是正整数",
+        "describe": lambda v: f"战斗轮数已设置为: {v}",
+    }
 
 
 @AgentServer.custom_action("SetAutoEInterval")
-class SetAutoEInterval(CustomAction):
+class SetAutoEInterval(_SetConfigAction):
     """
     设置自动 E 周期（毫秒）到全局配置
     参数示例：
@@ -179,48 +165,18 @@ class SetAutoEInterval(CustomAction):
     }
     """
 
-    def run(
-        self,
-        context: Context,
-        argv: CustomAction.RunArg,
-    ) -> bool:
-        try:
-            if isinstance(argv.custom_action_param, str):
-                params = json.loads(argv.custom_action_param)
-            elif isinstance(argv.custom_action_param, dict):
-                params = argv.custom_action_param
-            else:
-                logger.error(f"[SetAutoEInterval] 参数类型错误: {type(argv.custom_action_param)}")
-                return False
-
-            val = params.get("auto_e_interval_ms", None)
-            if val is None:
-                logger.error("[SetAutoEInterval] 缺少 auto_e_interval_ms")
-                return False
-            try:
-                val = int(val)
-            except Exception:
-                logger.error(f"[SetAutoEInterval] 非法的数值: {val}")
-                return False
-
-            if val <= 0:
-                logger.error(f"[SetAutoEInterval] 必须为正整数毫秒: {val}")
-                return False
-
-            GAME_CONFIG["auto_e_interval_ms"] = val
-            logger.info(f"[SetAutoEInterval] [OK] 自动E周期(ms) = {val}")
-
-            # 刷新截图缓存
-            job = context.tasker.controller.post_screencap()
-            job.wait()
-            return True
-        except Exception as e:
-            logger.error(f"[SetAutoEInterval] 发生异常: {e}", exc_info=True)
-            return False
+    SPEC = {
+        "key": "auto_e_interval_ms",
+        "param_key": "auto_e_interval_ms",
+        "default": _REQUIRED,
+        "coerce": True,
+        "validate": lambda v: None if v > 0 else f"必须为正整数毫秒: {v}",
+        "describe": lambda v: f"自动E周期(ms) = {v}",
+    }
 
 
 @AgentServer.custom_action("SetRoundTimeout")
-class SetRoundTimeout(CustomAction):
+class SetRoundTimeout(_SetConfigAction):
     """
     设置单轮战斗超时（毫秒）到全局配置（统一命名为 round_timeout）
     参数示例：
@@ -230,40 +186,11 @@ class SetRoundTimeout(CustomAction):
     备注：多轮战斗每轮超时按本值执行。
     """
 
-    def run(
-        self,
-        context: Context,
-        argv: CustomAction.RunArg,
-    ) -> bool:
-        try:
-            if isinstance(argv.custom_action_param, str):
-                params = json.loads(argv.custom_action_param)
-            elif isinstance(argv.custom_action_param, dict):
-                params = argv.custom_action_param
-            else:
-                logger.error(f"[SetRoundTimeout] 参数类型错误: {type(argv.custom_action_param)}")
-                return False
-
-            val = params.get("round_timeout_ms", None)
-            if val is None:
-                logger.error("[SetRoundTimeout] 缺少 round_timeout_ms")
-                return False
-            try:
-                val = int(val)
-            except Exception:
-                logger.error(f"[SetRoundTimeout] 非法的数值: {val}")
-                return False
-
-            if val <= 0:
-                logger.error(f"[SetRoundTimeout] 必须为正整数毫秒: {val}")
-                return False
-
-            GAME_CONFIG["round_timeout_ms"] = val
-            logger.info(f"[SetRoundTimeout] [OK] 单轮战斗超时(round_timeout_ms) = {val}")
-
-            job = context.tasker.controller.post_screencap()
-            job.wait()
-            return True
-        except Exception as e:
-            logger.error(f"[SetRoundTimeout] 发生异常: {e}", exc_info=True)
-            return False
+    SPEC = {
+        "key": "round_timeout_ms",
+        "param_key": "round_timeout_ms",
+        "default": _REQUIRED,
+        "coerce": True,
+        "validate": lambda v: None if v > 0 else f"必须为正整数毫秒: {v}",
+        "describe": lambda v: f"单轮战斗超时(round_timeout_ms) = {v}",
+    }
@@ -1,5 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import os
 import shutil
 import sys
 
@@ -20,51 +22,100 @@ install_path = working_dir / Path("install")
 version = len(sys.argv) > 1 and sys.argv[1] or "v0.0.1"
 
 
-def install_deps():
+def check_deps():
     if not (working_dir / "deps" / "bin").exists():
         print("Please download the MaaFramework to \"deps\" first.")
         print("请先下载 MaaFramework 到 \"deps\"。")
         sys.exit(1)
 
-    shutil.copytree(
-        working_dir / "deps" / "bin",
-        install_path,
-        ignore=shutil.ignore_patterns(
-            "*MaaDbgControlUnit*",
-            "*MaaThriftControlUnit*",
-            "*MaaRpc*",
-            "*MaaHttp*",
-        ),
-        dirs_exist_ok=True,
-    )
-    shutil.copytree(
-        working_dir / "deps" / "share" / "MaaAgentBinary",
-        install_path / "MaaAgentBinary",
-        dirs_exist_ok=True,
-    )
-
 
-def install_resource():
+def fast_copytree(src, dst, ignore=None):
+    # scandir-based copytree replacement: reuses the type info cached on the
+    # scandir entries instead of re-stat()ing every path, and copies file
+    # contents with shutil.copyfile, which takes the platform fast path
+    # (sendfile on Linux, CopyFile2 on Windows). Skips the per-file metadata
+    # copy that copytree/copy2 would do; the install artifacts don't need it.
+    os.makedirs(dst, exist_ok=True)
+    with os.scandir(src) as it:
+        entries = list(it)
+    ignored = ignore(src, [entry.name for entry in entries]) if ignore is not None else ()
+    for entry in entries:
+        if entry.name in ignored:
+            continue
+        target = os.path.join(dst, entry.name)
+        if entry.is_dir(follow_symlinks=False):
+            fast_copytree(entry.path, target, ignore)
+        else:
+            shutil.copyfile(entry.path, target)
+
+
+def install_trees():
+    # The four directory copies are independent (disjoint destinations) and
+    # IO-bound, so run them concurrently instead of back to back.
+    jobs = [
+        (
+            working_dir / "deps" / "bin",
+            install_path,
+            shutil.ignore_patterns(
+                "*MaaDbgControlUnit*",
+                "*MaaThriftControlUnit*",
+                "*MaaRpc*",
+                "*MaaHttp*",
+            ),
+        ),
+        (
+            working_dir / "deps" / "share" / "MaaAgentBinary",
+            install_path / "MaaAgentBinary",
+            None,
+        ),
+        (
+            working_dir / "assets" / "resource",
+            install_path / "resource",
+            None,
+        ),
+        (
+            working_dir / "agent",
+            install_path / "agent",
+            None,
+        ),
+    ]
 
-    configure_ocr_model()
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        futures = [
+            pool.submit(fast_copytree, src, dst, ignore)
+            for src, dst, ignore in jobs
+        ]
+        for future in futures:
+            future.result()
 
-    shutil.copytree(
-        working_dir / "assets" / "resource",
-        install_path / "resource",
-        dirs_exist_ok=True,
-    )
-    shutil.copy2(
-        working_dir / "assets" / "interface.json",
-        install_path,
-    )
 
-    with open(install_path / "interface.json", "r", encoding="utf-8") as f:
+def install_resource():
+    # Parse interface.json once from the source and write the bumped copy
+    # directly, instead of copying it and re-reading the copy.
+    with open(working_dir / "assets" / "interface.json", "r", encoding="utf-8") as f:
         interface = jsonc.load(f)
 
     interface["version"] = version
 
-    with open(install_path / "interface.json", "w", encoding="utf-8") as f:
+    # Write to a temp file and atomically swap it in, so an interrupted or
+    # concurrent install never exposes a truncated interface.json.
+    target = install_path / "interface.json"
+    tmp = target.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
         jsonc.dump(interface, f, ensure_ascii=False, indent=4)
+    os.replace(tmp, target)
+
+
+def deps_is_windows():
+    # On a Windows host the deps are a Windows build by construction; no
+    # need to touch the filesystem at all.
+    if sys.platform == "win32":
+        return True
+    # Otherwise look for DLLs in deps/bin (Windows MaaFramework builds ship
+    # them). any() over one scandir pass stops at the first hit instead of
+    # collecting a full glob("*.dll") match list.
+    with os.scandir(working_dir / "deps" / "bin") as it:
+        return any(entry.name.lower().endswith(".dll") for entry in it)
 
 
 def install_chores():
@@ -76,22 +127,18 @@ def install_chores():
         working_dir / "LICENSE",
         install_path,
     )
+    # Ship the runtime requirements matching the deps flavor.
+    requirements = "requirements_win.txt" if deps_is_windows() else "requirements.txt"
     shutil.copy2(
-        working_dir / "requirements.txt",
-        install_path,
-    )
-
-def install_agent():
-    shutil.copytree(
-        working_dir / "agent",
-        install_path / "agent",
-        dirs_exist_ok=True,
+        working_dir / requirements,
+        install_path / "requirements.txt",
     )
 
 if __name__ == "__main__":
-    install_deps()
+    check_deps()
+    configure_ocr_model()
+    install_trees()
     install_resource()
     install_chores()
-    install_agent()
 
-    print(f"Install to {install_path} successfully.")
\ No newline at end of file
+    print(f"Install to {install_path} successfully.")